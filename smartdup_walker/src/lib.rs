@@ -0,0 +1,93 @@
+//! SmartDuplicateHunter - Walker nativo
+//! Recorre el árbol con jwalk (lecturas de directorio en paralelo con rayon)
+//! y aplica los mismos filtros que FileScanner sin tomar el GIL.
+
+use std::collections::HashSet;
+use std::path::PathBuf;
+
+use jwalk::{Parallelism, WalkDir};
+use pyo3::prelude::*;
+
+/// (ruta, tamaño) de un archivo aceptado
+type FileEntry = (PathBuf, u64);
+
+/// Recorrer `root` y devolver los archivos que pasan los filtros
+///
+/// Los directorios excluidos se podan antes de leerse; las extensiones se
+/// comparan como sufijos en minúsculas, igual que en el scanner de Python.
+#[pyfunction]
+#[pyo3(signature = (
+    root,
+    include_extensions,
+    exclude_directories,
+    min_file_size,
+    max_file_size,
+    ignore_hidden = true,
+    follow_symlinks = false,
+    max_workers = 32
+))]
+#[allow(clippy::too_many_arguments)]
+fn walk(
+    py: Python<'_>,
+    root: PathBuf,
+    include_extensions: HashSet<String>,
+    exclude_directories: HashSet<String>,
+    min_file_size: u64,
+    max_file_size: u64,
+    ignore_hidden: bool,
+    follow_symlinks: bool,
+    max_workers: usize,
+) -> Vec<FileEntry> {
+    py.allow_threads(move || {
+        let walker = WalkDir::new(root)
+            .skip_hidden(ignore_hidden)
+            .follow_links(follow_symlinks)
+            .parallelism(Parallelism::RayonNewPool(max_workers.max(1)))
+            .process_read_dir(move |_depth, _path, _state, children| {
+                // Podar antes de descender: los excluidos nunca se leen
+                children.retain(|child| match child {
+                    Ok(entry) => {
+                        !(entry.file_type().is_dir()
+                            && entry
+                                .file_name()
+                                .to_str()
+                                .is_some_and(|name| exclude_directories.contains(name)))
+                    }
+                    Err(_) => true,
+                });
+            });
+
+        let mut files = Vec::new();
+        for entry in walker.into_iter().flatten() {
+            if !entry.file_type().is_file() {
+                continue;
+            }
+
+            if !include_extensions.is_empty() {
+                let name = entry.file_name().to_string_lossy().to_lowercase();
+                if !include_extensions.iter().any(|ext| name.ends_with(ext.as_str())) {
+                    continue;
+                }
+            }
+
+            let Ok(metadata) = entry.metadata() else {
+                // No se puede acceder al archivo
+                continue;
+            };
+
+            let size = metadata.len();
+            if size == 0 || size < min_file_size || size > max_file_size {
+                continue;
+            }
+
+            files.push((entry.path(), size));
+        }
+        files
+    })
+}
+
+#[pymodule]
+fn smartdup_walker(m: &Bound<'_, PyModule>) -> PyResult<()> {
+    m.add_function(wrap_pyfunction!(walk, m)?)?;
+    Ok(())
+}
@@ -5,15 +5,36 @@ Módulo para escanear y filtrar archivos en directorios
 """
 
 import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Optional
-from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Literal, Set, Tuple, Optional
 from dataclasses import dataclass
 from tqdm import tqdm
 import yaml
 
+try:
+    # Backend opcional: statx en lote vía io_uring (solo Linux)
+    import liburing
+except ImportError:
+    liburing = None
 
-@dataclass
+try:
+    # Extensión nativa opcional (Rust/PyO3), ver smartdup_walker/
+    import smartdup_walker
+except ImportError:
+    smartdup_walker = None
+
+try:
+    # Parser en C (libyaml), ~10x más rápido que el de Python puro
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+@dataclass(slots=True, frozen=True)
 class ScanConfig:
     """Configuración para el escaneo de archivos"""
     include_extensions: Set[str]
@@ -22,15 +43,89 @@ class ScanConfig:
     max_file_size: int
     follow_symlinks: bool = False
     ignore_hidden: bool = True
+    max_workers: int = 32
+    strategy: Literal["sync", "parallel", "native"] = "sync"
+    use_io_uring: bool = False
+    sort_by_inode: bool = False
+    traversal_order: Literal["depth", "breadth"] = "depth"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FileInfo:
-    """Información de un archivo encontrado"""
-    path: Path
+    """Información de un archivo encontrado (path como str; usar Path(info.path) si hace falta)"""
+    path: str
     size: int
-    modified_time: float
-    extension: str
+
+
+# Archivo aceptado por un recorrido, antes de materializar el FileInfo
+FileEntry = Tuple[str, int]
+
+# Resultado mínimo de stat: (es archivo regular, tamaño)
+StatTuple = Tuple[bool, int]
+
+
+class UringStatBatch:
+    """
+    Stat en lote con io_uring: envía un statx por ruta y los recoge en una
+    sola entrada al kernel, en lugar de una llamada al sistema por archivo
+    
+    Requiere el paquete opcional liburing y un kernel con soporte de io_uring.
+    """
+    
+    def __init__(self, entries: int = 256):
+        if liburing is None:
+            raise RuntimeError("liburing no está instalado")
+        self.entries = entries
+        self.ring = liburing.Ring()
+        self.cqe = liburing.Cqe()
+        liburing.io_uring_queue_init(entries, self.ring)
+    
+    def stat_many(self, paths: List[str], follow_symlinks: bool) -> List[Optional[StatTuple]]:
+        """
+        Hacer stat de todas las rutas en lotes de `entries`
+        
+        Returns:
+            Lista paralela a paths con (es archivo regular, tamaño), o None
+            si el archivo no es accesible
+        """
+        ring = self.ring
+        cqe = self.cqe
+        flags = 0 if follow_symlinks else liburing.AT_SYMLINK_NOFOLLOW
+        mask = liburing.STATX_TYPE | liburing.STATX_SIZE
+        results: List[Optional[StatTuple]] = [None] * len(paths)
+        
+        for start in range(0, len(paths), self.entries):
+            chunk = paths[start:start + self.entries]
+            buffers = []
+            for i, path in enumerate(chunk):
+                sqe = liburing.io_uring_get_sqe(ring)
+                statx = liburing.Statx()
+                buffers.append(statx)
+                liburing.io_uring_prep_statx(sqe, statx, path, flags, mask)
+                liburing.io_uring_sqe_set_data64(sqe, i)
+            
+            # Una sola entrada al kernel para enviar el lote y esperar todos los resultados
+            liburing.io_uring_submit_and_wait(ring, len(chunk))
+            for _ in range(len(chunk)):
+                # cqe[0] se reutiliza: ya hay resultados listos, no bloquea
+                liburing.io_uring_wait_cqe(ring, cqe)
+                completion = cqe[0]
+                i = completion.user_data
+                try:
+                    # res lanza OSError si el statx falló
+                    completion.res
+                except OSError:
+                    pass
+                else:
+                    statx = buffers[i]
+                    results[start + i] = (statx.isreg, statx.size)
+                liburing.io_uring_cqe_seen(ring, completion)
+        
+        return results
+    
+    def close(self):
+        """Liberar el anillo de io_uring"""
+        liburing.io_uring_queue_exit(self.ring)
 
 
 class FileScanner:
@@ -44,7 +139,15 @@ class FileScanner:
             config_path: Ruta al archivo de configuración YAML
         """
         self.config = self._load_config(config_path)
-        self.files_by_size: Dict[int, List[FileInfo]] = defaultdict(list)
+        self._excluded_names = frozenset(self.config.exclude_directories)
+        self._ext_set = frozenset(self.config.include_extensions)
+        # str.endswith con una tupla compara todos los sufijos en una sola llamada en C
+        self._ext_suffixes = tuple(sorted(self._ext_set))
+        self._skip_dir = self._make_dir_filter()
+        # Ruta del primer archivo visto de cada tamaño; solo se convierte en
+        # FileInfo y pasa a files_by_size al aparecer un segundo archivo
+        self._single: Dict[int, str] = {}
+        self.files_by_size: Dict[int, List[FileInfo]] = {}
         self.total_files_found = 0
         self.total_size_scanned = 0
         
@@ -66,13 +169,18 @@ class FileScanner:
                 ],
                 'min_file_size': 1024,  # 1KB
                 'max_file_size': 10737418240,  # 10GB
+                'max_workers': 32,
+                'strategy': 'sync',  # 'sync' (secuencial), 'parallel' (pool de hilos) o 'native' (Rust)
+                'use_io_uring': False,  # statx en lote (requiere liburing)
+                'sort_by_inode': False,  # ordenar entradas por inodo (discos mecánicos)
+                'traversal_order': 'depth',  # 'depth' (localidad) o 'breadth' (progreso temprano)
             }
         }
         
         if config_path and Path(config_path).exists():
             try:
                 with open(config_path, 'r', encoding='utf-8') as f:
-                    user_config = yaml.safe_load(f)
+                    user_config = yaml.load(f, Loader=SafeLoader)
                     # Merge con configuración default
                     scanning_config = {**default_config['scanning'], **user_config.get('scanning', {})}
             except Exception as e:
@@ -85,74 +193,103 @@ class FileScanner:
             include_extensions=set(ext.lower() for ext in scanning_config['include_extensions']),
             exclude_directories=set(scanning_config['exclude_directories']),
             min_file_size=scanning_config['min_file_size'],
-            max_file_size=scanning_config['max_file_size']
+            max_file_size=scanning_config['max_file_size'],
+            max_workers=scanning_config['max_workers'],
+            strategy=scanning_config['strategy'],
+            use_io_uring=scanning_config['use_io_uring'],
+            sort_by_inode=scanning_config['sort_by_inode'],
+            traversal_order=scanning_config['traversal_order']
         )
     
-    def _should_include_file(self, file_path: Path) -> bool:
+    def _make_dir_filter(self) -> Callable[[str], bool]:
         """
-        Determinar si un archivo debe incluirse en el análisis
+        Construir una sola vez el predicado de directorios a omitir
         
-        Args:
-            file_path: Ruta del archivo a evaluar
-            
         Returns:
-            True si el archivo debe incluirse
+            Función que recibe el nombre de un directorio y devuelve True si
+            no debe explorarse
         """
-        # Verificar extensión
-        if self.config.include_extensions and file_path.suffix.lower() not in self.config.include_extensions:
-            return False
-        
-        # Ignorar archivos ocultos si está configurado
-        if self.config.ignore_hidden and file_path.name.startswith('.'):
-            return False
-        
-        try:
-            # Verificar tamaño
-            size = file_path.stat().st_size
-            if size < self.config.min_file_size or size > self.config.max_file_size:
-                return False
-            
-            # Verificar que no sea un archivo de tamaño 0
-            if size == 0:
-                return False
-                
-        except (OSError, FileNotFoundError):
-            # No se puede acceder al archivo
-            return False
-        
-        return True
+        excluded = self._excluded_names
+        if self.config.ignore_hidden:
+            # Comprobación barata primero: startswith es una llamada en C
+            return lambda name: name.startswith('.') or name in excluded
+        return excluded.__contains__
     
-    def _should_include_directory(self, dir_path: Path) -> bool:
+    def scan_directory(self, directory: str, show_progress: bool = True) -> Dict[int, List[FileInfo]]:
         """
-        Determinar si un directorio debe explorarse
+        Escanear un directorio y retornar archivos agrupados por tamaño
         
         Args:
-            dir_path: Ruta del directorio a evaluar
+            directory: Ruta del directorio a escanear
+            show_progress: Mostrar barra de progreso
             
         Returns:
-            True si el directorio debe explorarse
+            Diccionario con grupos de 2+ archivos del mismo tamaño
         """
-        # Verificar si está en la lista de exclusión
-        if dir_path.name in self.config.exclude_directories:
-            return False
+        directory_path = self._validate_directory(directory)
         
-        # Ignorar directorios ocultos si está configurado
-        if self.config.ignore_hidden and dir_path.name.startswith('.'):
-            return False
+        print(f"🔍 Escaneando: {directory_path.absolute()}")
+        print(f"📋 Filtros: extensiones={len(self.config.include_extensions)}, "
+              f"tamaño={self._format_size(self.config.min_file_size)}-{self._format_size(self.config.max_file_size)}")
+        
+        # Resetear contadores
+        # Diccionarios nuevos en vez de clear(): el resultado de un escaneo
+        # anterior ya entregado al llamador no se vacía
+        self._single = {}
+        self.files_by_size = {}
+        self.total_files_found = 0
+        self.total_size_scanned = 0
         
-        return True
+        # Pasada única: la barra cuenta archivos visitados, sin total previo
+        pbar = tqdm(desc="Escaneando archivos", unit=" archivos", unit_scale=True,
+                    dynamic_ncols=True) if show_progress else None
+        
+        try:
+            add_file = self._add_file
+            for path, size in self._walk(directory_path, pbar):
+                add_file(path, size)
+        finally:
+            if pbar is not None:
+                pbar.close()
+        
+        # Mostrar estadísticas
+        self._print_scan_statistics()
+        
+        return self.files_by_size
     
-    def scan_directory(self, directory: str, show_progress: bool = True) -> Dict[int, List[FileInfo]]:
+    def iter_files(self, directory: str, pbar=None) -> Iterator[FileInfo]:
         """
-        Escanear un directorio y retornar archivos agrupados por tamaño
+        Recorrer un directorio produciendo cada archivo aceptado según se descubre
+        
+        No agrupa ni imprime estadísticas, de modo que la etapa siguiente
+        (hashing) puede empezar antes de que termine el escaneo.
         
         Args:
             directory: Ruta del directorio a escanear
-            show_progress: Mostrar barra de progreso
+            pbar: Barra de progreso opcional, actualizada por archivo visitado
             
         Returns:
-            Diccionario con archivos agrupados por tamaño
+            Iterador de FileInfo que pasan los filtros
         """
+        directory_path = self._validate_directory(directory)
+        return (FileInfo(path, size) for path, size in self._walk(directory_path, pbar))
+    
+    def _walk(self, directory_path: Path, pbar=None) -> Iterator[FileEntry]:
+        """Elegir el recorrido según config.strategy"""
+        if self.config.strategy == "sync":
+            return self._walk_sync(directory_path, pbar)
+        if self.config.strategy == "parallel":
+            return self._walk_parallel(directory_path, pbar)
+        if self.config.strategy == "native":
+            if smartdup_walker is None:
+                print("⚠️  smartdup_walker no está instalado; usando recorrido 'sync'")
+                return self._walk_sync(directory_path, pbar)
+            return self._walk_native(directory_path, pbar)
+        raise ValueError(f"Estrategia de escaneo desconocida: {self.config.strategy}")
+    
+    @staticmethod
+    def _validate_directory(directory: str) -> Path:
+        """Comprobar que la ruta existe y es un directorio"""
         directory_path = Path(directory)
         if not directory_path.exists():
             raise FileNotFoundError(f"El directorio no existe: {directory}")
@@ -160,80 +297,217 @@ class FileScanner:
         if not directory_path.is_dir():
             raise NotADirectoryError(f"La ruta no es un directorio: {directory}")
         
-        print(f"🔍 Escaneando: {directory_path.absolute()}")
-        print(f"📋 Filtros: extensiones={len(self.config.include_extensions)}, "
-              f"tamaño={self._format_size(self.config.min_file_size)}-{self._format_size(self.config.max_file_size)}")
+        return directory_path
+    
+    def _walk_sync(self, directory_path: Path, pbar=None) -> Iterator[FileEntry]:
+        """
+        Recorrer el árbol secuencialmente con una pila explícita de
+        directorios (sin recursión ni límite de profundidad)
         
-        # Resetear contadores
-        self.files_by_size.clear()
-        self.total_files_found = 0
-        self.total_size_scanned = 0
+        Más ligero que el pool de hilos y mejor en discos mecánicos,
+        donde las lecturas concurrentes provocan saltos del cabezal.
+        """
+        # Los stat se hacen por directorio, en lote si io_uring está disponible
+        uring = self._open_uring() if self.config.use_io_uring else None
+        stat_many = uring.stat_many if uring is not None else None
         
-        # Primera pasada: contar archivos para la barra de progreso
-        if show_progress:
-            print("📊 Analizando estructura de directorios...")
-            total_files = self._count_files(directory_path)
-            pbar = tqdm(total=total_files, desc="Escaneando archivos", unit="archivos")
+        # pop = en profundidad (mejor localidad); popleft = en anchura
+        # (los directorios superficiales aparecen antes)
+        stack = deque([str(directory_path)])
+        next_directory = stack.popleft if self.config.traversal_order == "breadth" else stack.pop
+        scan = self._scan_single_directory
         
-        # Segunda pasada: procesar archivos
         try:
-            self._scan_recursive(directory_path, pbar if show_progress else None)
+            while stack:
+                subdirs, files = scan(next_directory(), pbar, stat_many)
+                yield from files
+                stack.extend(subdirs)
         finally:
-            if show_progress:
-                pbar.close()
+            if uring is not None:
+                uring.close()
+    
+    @staticmethod
+    def _open_uring() -> Optional[UringStatBatch]:
+        """Crear el anillo de io_uring, o None para usar stat por archivo"""
+        if liburing is None:
+            print("⚠️  liburing no está instalado; usando stat por archivo")
+            return None
+        try:
+            return UringStatBatch()
+        except OSError as e:
+            print(f"⚠️  io_uring no disponible ({e}); usando stat por archivo")
+            return None
+    
+    def _walk_native(self, directory_path: Path, pbar=None) -> Iterator[FileEntry]:
+        """
+        Recorrer el árbol con la extensión nativa smartdup_walker, que filtra
+        en Rust y libera el GIL durante todo el recorrido
         
-        # Mostrar estadísticas
-        self._print_scan_statistics()
+        El recorrido devuelve los archivos al terminar, así que la barra de
+        progreso avanza de una vez y solo cuenta los archivos aceptados.
+        """
+        files = smartdup_walker.walk(
+            str(directory_path),
+            self._ext_set,
+            self._excluded_names,
+            self.config.min_file_size,
+            self.config.max_file_size,
+            ignore_hidden=self.config.ignore_hidden,
+            follow_symlinks=self.config.follow_symlinks,
+            max_workers=self.config.max_workers,
+        )
         
-        return dict(self.files_by_size)
+        if pbar is not None:
+            pbar.update(len(files))
+        
+        yield from files
     
-    def _count_files(self, directory_path: Path) -> int:
-        """Contar archivos totales para la barra de progreso"""
-        count = 0
+    def _walk_parallel(self, directory_path: Path, pbar=None) -> Iterator[FileEntry]:
+        """
+        Recorrer el árbol con un pool de hilos: cada tarea escanea un
+        directorio, publica sus archivos en una cola y encola sus
+        subdirectorios como nuevas tareas
+        """
+        lock = threading.Lock()
+        results: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        pending = 0
+        executor = ThreadPoolExecutor(max_workers=self.config.max_workers)
+        
+        def submit(path):
+            nonlocal pending
+            with lock:
+                pending += 1
+            executor.submit(worker, path)
+        
+        def worker(path):
+            nonlocal pending
+            try:
+                if not stop.is_set():
+                    subdirs, files = self._scan_single_directory(path, pbar)
+                    if files:
+                        results.put(files)
+                    for subdir in subdirs:
+                        submit(subdir)
+            except BaseException as e:
+                results.put(e)
+            finally:
+                with lock:
+                    pending -= 1
+                    finished = pending == 0
+                # La última tarea en terminar cierra la cola
+                if finished:
+                    results.put(None)
+        
         try:
-            for item in directory_path.rglob('*'):
-                if item.is_file():
-                    count += 1
-        except (PermissionError, OSError):
-            pass
-        return count
+            submit(directory_path)
+            while True:
+                item = results.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield from item
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
     
-    def _scan_recursive(self, directory_path: Path, pbar=None):
-        """Escanear recursivamente un directorio"""
+    def _scan_single_directory(self, directory_path: Path, pbar=None,
+                               stat_many=None) -> Tuple[List[str], List[FileEntry]]:
+        """
+        Escanear un único directorio (sin descender)
+        
+        Args:
+            directory_path: Directorio a escanear
+            pbar: Barra de progreso opcional
+            stat_many: Stat en lote (UringStatBatch.stat_many); si es None se
+                usa entry.stat() por archivo
+            
+        Returns:
+            Tupla (subdirectorios que deben explorarse, archivos aceptados)
+        """
+        # Variables locales: evitan búsquedas de atributos por archivo
+        follow_symlinks = self.config.follow_symlinks
+        ignore_hidden = self.config.ignore_hidden
+        min_size = self.config.min_file_size
+        max_size = self.config.max_file_size
+        ext_suffixes = self._ext_suffixes
+        skip_dir = self._skip_dir
+        sort_by_inode = self.config.sort_by_inode
+        subdirs = []
+        files = []
+        candidates = []
         try:
-            for item in directory_path.iterdir():
-                if item.is_file():
-                    if pbar:
-                        pbar.update(1)
-                    
-                    if self._should_include_file(item):
-                        self._process_file(item)
+            with os.scandir(directory_path) as it:
+                # En discos mecánicos, hacer stat en orden de inodo reduce los
+                # saltos del cabezal; inode() viene del dirent, sin syscall
+                entries = sorted(it, key=os.DirEntry.inode) if sort_by_inode else it
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=follow_symlinks):
+                        if pbar is not None:
+                            pbar.update(1)
+                        
+                        # Filtros de archivo en línea (extensión, ocultos, tamaño)
+                        name = entry.name
+                        if ext_suffixes and not name.lower().endswith(ext_suffixes):
+                            continue
                         
-                elif item.is_dir() and self._should_include_directory(item):
-                    # Recursión en subdirectorios
-                    self._scan_recursive(item, pbar)
+                        if ignore_hidden and name.startswith('.'):
+                            continue
+                        
+                        if stat_many is not None:
+                            # El tamaño se obtiene en lote al terminar el directorio
+                            candidates.append(entry.path)
+                            continue
+                        
+                        try:
+                            st = entry.stat(follow_symlinks=follow_symlinks)
+                        except OSError:
+                            # No se puede acceder al archivo
+                            continue
+                        
+                        size = st.st_size
+                        if size == 0 or size < min_size or size > max_size:
+                            continue
+                        
+                        files.append((entry.path, size))
+                            
+                    elif entry.is_dir(follow_symlinks=follow_symlinks) and not skip_dir(entry.name):
+                        # Podar antes de encolar: los excluidos nunca se recorren
+                        subdirs.append(entry.path)
                     
         except (PermissionError, OSError) as e:
             print(f"⚠️  No se puede acceder a: {directory_path} - {e}")
+        
+        if candidates:
+            for path, result in zip(candidates, stat_many(candidates, follow_symlinks)):
+                if result is None:
+                    # No se puede acceder al archivo
+                    continue
+                
+                is_regular, size = result
+                if not is_regular or size == 0 or size < min_size or size > max_size:
+                    continue
+                
+                files.append((path, size))
+        
+        return subdirs, files
     
-    def _process_file(self, file_path: Path):
-        """Procesar un archivo individual y agregarlo a la agrupación por tamaño"""
-        try:
-            stat = file_path.stat()
-            file_info = FileInfo(
-                path=file_path,
-                size=stat.st_size,
-                modified_time=stat.st_mtime,
-                extension=file_path.suffix.lower()
-            )
-            
-            # Agrupar por tamaño
-            self.files_by_size[file_info.size].append(file_info)
-            self.total_files_found += 1
-            self.total_size_scanned += file_info.size
-            
-        except (OSError, FileNotFoundError) as e:
-            print(f"⚠️  Error procesando {file_path}: {e}")
+    def _add_file(self, path: str, size: int):
+        """Agregar un archivo a la agrupación por tamaño"""
+        # Caso común primero: tamaño nunca visto, se guarda solo la ruta (sin
+        # FileInfo ni lista); ambos se crean al aparecer el segundo archivo
+        first = self._single.pop(size, None)
+        if first is not None:
+            self.files_by_size[size] = [FileInfo(first, size), FileInfo(path, size)]
+        else:
+            group = self.files_by_size.get(size)
+            if group is not None:
+                group.append(FileInfo(path, size))
+            else:
+                self._single[size] = path
+        self.total_files_found += 1
+        self.total_size_scanned += size
     
     def get_potential_duplicates(self) -> Dict[int, List[FileInfo]]:
         """
@@ -242,7 +516,7 @@ class FileScanner:
         Returns:
             Diccionario con solo grupos que tienen 2+ archivos del mismo tamaño
         """
-        return {size: files for size, files in self.files_by_size.items() if len(files) > 1}
+        return self.files_by_size
     
     def _print_scan_statistics(self):
         """Imprimir estadísticas del escaneo"""